@@ -1,16 +1,22 @@
 #!/bin/python3
 
 import logging
+import logging.handlers
 import argparse
 from datetime import datetime
 import time
 import os
 import subprocess
 import shutil
+import threading
+import queue
 import re
+import select
 import sys
+import collections
 from fractions import Fraction
 
+import numpy as np
 import serial
 import picamera
 
@@ -27,7 +33,7 @@ FEEDRATE                = 2000
 FEEDRATE_SLOW           = 500
 
 # INTERVAL MODE
-PRE_CAPTURE_WAIT        = 0.1
+SETTLE_TIME             = 0.5
 POST_CAPTURE_WAIT       = 0.0
 
 MODE_INTERVAL           = "interval"
@@ -45,11 +51,56 @@ EXPOSURE_COMPENSATION   = 0
 
 # OSX (microscope lens)
 
-FEEDRATE                = 1000 
-PRE_CAPTURE_WAIT        = 2.0
+FEEDRATE                = 1000
 FILE_EXTENSION          = ".jpg"
 # OUTPUT_DIRECTORY        = "/Users/volzotan/Downloads/slider_output"
 
+# remove every non-alphanumeric / non-underscore / non-space / non-decimalpoint / non-dollarsign character
+_RESP_SCRUB = re.compile(rb"[^a-zA-Z0-9_ .$]")
+
+
+def _enable_low_latency(ser):
+
+    # FTDI/CH340 USB-serial converters default to a 16ms latency timer on linux,
+    # stalling every short GRBL handshake. Switch the port to low-latency mode
+    # via the TIOCGSERIAL/TIOCSSERIAL ioctl, falling back to the sysfs
+    # latency_timer knob. Fails silently on macOS / non-FTDI ports.
+
+    try:
+        import fcntl
+        import array
+        import termios
+
+        ASYNC_LOW_LATENCY = 1 << 13
+
+        buf = array.array("i", [0] * 32)
+        fcntl.ioctl(ser.fileno(), termios.TIOCGSERIAL, buf)
+        buf[4] |= ASYNC_LOW_LATENCY
+        fcntl.ioctl(ser.fileno(), termios.TIOCSSERIAL, buf)
+
+        log.debug("low latency mode enabled for %s", ser.port)
+        return
+    except Exception as e:
+        log.debug("low latency ioctl failed: %s", e)
+
+    try:
+        sysfs_path = "/sys/bus/usb-serial/devices/{}/latency_timer".format(
+            os.path.basename(ser.port))
+        with open(sysfs_path, "w") as f:
+            f.write("1")
+
+        log.debug("low latency timer set via sysfs for %s", ser.port)
+    except Exception as e:
+        log.debug("low latency sysfs fallback failed: %s", e)
+
+
+# fail fast if no reply arrives within the deadline instead of letting
+# pyserial's 500ms read timeout expire on an empty buffer
+def _wait_readable(ser, deadline):
+    readable, _, _ = select.select([ser.fileno()], [], [], deadline)
+    if not readable:
+        raise TimeoutError("no serial data within {}s".format(deadline))
+
 
 def _send_command(ser, cmd, param=None):
     response = ""
@@ -61,65 +112,182 @@ def _send_command(ser, cmd, param=None):
         else:
             full_cmd = "{} {}".format(cmd, param)
 
-        log.debug("serial send: {}".format(full_cmd))
+        log.debug("serial send: %s", full_cmd)
 
-        ser.write(bytearray(full_cmd, "utf-8"))
-        ser.write(bytearray("\n", "utf-8"))
+        ser.write(full_cmd.encode("ascii") + b"\n")
 
-        response = ser.read(100)
-        response = response.decode("utf-8") 
+        # line-delimited read returns as soon as the terminator arrives
+        # instead of blocking on the timeout waiting for 100 bytes
+        _wait_readable(ser, SERIAL_TIMEOUT_READ)
+        response = ser.read_until(b"\n", size=256)
 
-        # remove every non-alphanumeric / non-underscore / non-space / non-decimalpoint / non-dollarsign character
-        response = re.sub("[^a-zA-Z0-9_ .$]", '', response)
+        # grbl replies are plain ascii, stay in bytes and only decode
+        # on the rare path that actually returns payload
+        response = _RESP_SCRUB.sub(b"", response)
 
-        log.debug("serial receive: {}".format(response))
+        log.debug("serial receive: %s", response)
 
         if response is None or len(response) == 0:
-            log.debug("empty response".format())
+            log.debug("empty response")
             raise Exception("empty response or timeout")
 
-        if cmd == "?":
-            return response
-
-        if response.startswith(cmd):
+        if response.startswith(cmd.encode("ascii")):
             response = response[len(cmd):]
 
-        if response.startswith("ok"):        
+        if response.startswith(b"ok"):
             if len(response) > 1:
-                return response[3:]
-            else: 
+                return response[3:].decode("ascii", "ignore")
+            else:
                 return None
         else:
-            log.debug("serial error, non ok response: {}".format(response))
+            log.debug("serial error, non ok response: %s", response)
             raise Exception("serial error, non ok response: {}".format(response))
 
     except serial.serialutil.SerialException as se:
-        log.error("comm failed, SerialException: {}".format(se))
+        log.error("comm failed, SerialException: %s", se)
         raise se
 
     except Exception as e:
-        log.error("comm failed, unknown exception: {}".format(e))
+        log.error("comm failed, unknown exception: %s", e)
         raise e
 
 
+# stream a batch of commands with the grbl character-counting protocol:
+# keep the 128 byte RX buffer topped up instead of blocking on each ok,
+# so grbl parses/plans while the next command is already on the wire
+def _stream_commands(ser, cmds):
+    GRBL_RX_BUFFER_SIZE = 127
+
+    pending = [cmd.encode("utf-8") + b"\n" for cmd in cmds]
+    inflight = collections.deque()
+
+    while len(pending) > 0 or len(inflight) > 0:
+        if len(pending) > 0 and sum(inflight) + len(pending[0]) <= GRBL_RX_BUFFER_SIZE:
+            data = pending.pop(0)
+            ser.write(data)
+            inflight.append(len(data))
+            log.debug("serial stream send: %s", data)
+            continue
+
+        response = ser.read_until(b"\n", size=256)
+        response = _RESP_SCRUB.sub(b"", response)
+
+        if len(response) == 0:
+            raise Exception("empty response or timeout")
+
+        if response.startswith(b"ok"):
+            inflight.popleft()
+        else:
+            raise Exception("serial error, non ok response: {}".format(response))
+
+
+_filename_counters = {}
+
 def _acquire_filename(path):
-    filename = None
-
-    for i in range(0, 9999):
-        name = i
-        name = str(name).zfill(4)
-        testname = name + FILE_EXTENSION
-        if not os.path.exists(os.path.join(path, testname)):
-            filename = testname
-            break
 
-    log.debug("acquired filename: {}".format(filename))
+    # scan the directory once for the highest index, afterwards just
+    # increment a cached counter instead of stat-ing candidates
+    if path not in _filename_counters:
+        max_index = -1
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.endswith(FILE_EXTENSION) and entry.name[:4].isdigit():
+                        max_index = max(max_index, int(entry.name[:4]))
+        except OSError as e:
+            log.error("scanning directory %s failed: %s", path, e)
+            raise Exception("could not acquire filename: {}".format(e))
+
+        _filename_counters[path] = max_index
+
+    _filename_counters[path] += 1
+
+    if _filename_counters[path] > 9999:
+        raise Exception("could not acquire filename: no free index in {}".format(path))
+
+    filename = str(_filename_counters[path]).zfill(4) + FILE_EXTENSION
+
+    log.debug("acquired filename: %s", filename)
 
     return (path, filename)
 
 
+def _capture_picamera(dest):
+    # the video port skips the still-port sensor mode switch (~500-800ms
+    # per shot on the HQ module) and just grabs the next streamed frame
+    camera.capture(dest, use_video_port=args["video_port"])
+
+
+# keep a single gphoto2 shell running across shots so the USB session
+# survives between captures instead of paying fork + camera init per frame
+def _gphoto_session():
+    global gphoto_shell
+
+    if gphoto_shell is None or gphoto_shell.poll() is not None:
+        gphoto_shell = subprocess.Popen(
+            ["gphoto2", "--shell"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        _gphoto_wait_prompt(gphoto_shell)
+
+    return gphoto_shell
+
+
+def _gphoto_wait_prompt(proc):
+    output = ""
+
+    while True:
+        c = proc.stdout.read(1)
+        if c == "":
+            raise Exception("gphoto2 shell terminated")
+        output += c
+        if output.endswith("> "):
+            return output
+
+
+def _capture_gphoto(dest):
+    proc = _gphoto_session()
+
+    proc.stdin.write("capture-image-and-download --filename {} --force-overwrite\n".format(dest))
+    proc.stdin.flush()
+    _gphoto_wait_prompt(proc)
+
+    if not os.path.exists(dest):
+        # older gphoto2 shells ignore --filename and store to the cwd
+        temp_file = "capt0000{}".format(FILE_EXTENSION)
+        if not os.path.exists(temp_file):
+            raise Exception("captured image file missing")
+        shutil.move(temp_file, dest)
+
+
+# capture and file I/O run on a worker thread so grbl can start the next
+# move while the previous frame is still being downloaded/written
+def _capture_worker(q):
+    while True:
+        item = q.get()
+        try:
+            if item is None:
+                break
+
+            dest, capture_fn = item
+            capture_fn(dest)
+        except Exception as e:
+            log.error("capture failed: %s", e)
+            capture_errors.append(e)
+        finally:
+            q.task_done()
+
+
+def _flush_log():
+    for handler in log.handlers:
+        try:
+            handler.flush()
+        except Exception:
+            pass
+
+
 def global_except_hook(exctype, value, traceback):
     close_ports()
+    _flush_log()
     sys.__excepthook__(exctype, value, traceback)
 
 
@@ -128,12 +296,37 @@ def wait_for_idle():
     while(True):
         try:
             # example: <Idle|MPos:17.530,0.000,0.000|FS:0,0|WCO:0.000,0.000,0.000>
-            resp = _send_command(ser_grbl, "?")
+            ser_grbl.write(b"?")
+
+            buf = b""
+            while(True):
+                # sleep on the fd till bytes arrive instead of burning a full
+                # read timeout on an empty buffer
+                readable, _, _ = select.select([ser_grbl.fileno()], [], [], 0.05)
+                if not readable:
+                    break
+
+                time.sleep(0.01)
+                buf += ser_grbl.read(ser_grbl.in_waiting)
+
+                # only return once the report's closing > has arrived,
+                # otherwise its tail stays in the OS buffer and corrupts
+                # the next _send_command response
+                idx = buf.find(b"<Idle")
+                if idx != -1:
+                    if buf.find(b">", idx) != -1:
+                        return
+                    # idle report still in flight, keep reading
+                    continue
+
+                if b">" in buf:
+                    # complete status report but not idle, poll again
+                    break
+
+            time.sleep(0.01)
 
-            if resp.startswith("Idle"):
-                break
         except Exception as e:
-            log.debug("wait-for-idle loop failed: {}".format(e))
+            log.debug("wait-for-idle loop failed: %s", e)
  
 
 def init_picamera():
@@ -158,10 +351,10 @@ def init_picamera():
             camera.resolution = resolutions[key][0]
             # camera.framerate = resolutions[key][1]
             camera_type = key
-            log.info("camera resolution set to [{}]: {}".format(key, resolutions[key][0]))
+            log.info("camera resolution set to [%s]: %s", key, resolutions[key][0])
             break
         except picamera.exc.PiCameraValueError as e:
-            log.debug("failing setting camera resolution for {}, attempting fallback".format(key))
+            log.debug("failing setting camera resolution for %s, attempting fallback", key)
 
     camera.start_preview()
 
@@ -183,8 +376,20 @@ def close_ports():
         camera.stop_preview()
         camera.close()
 
+    if not gphoto_shell is None:
+        try:
+            gphoto_shell.stdin.write("exit\n")
+            gphoto_shell.stdin.flush()
+            gphoto_shell.wait(timeout=2.0)
+        except Exception:
+            gphoto_shell.kill()
+
+    _flush_log()
+
 
 log = logging.getLogger()
+capture_errors = []
+gphoto_shell = None
 
 if __name__ == "__main__":
 
@@ -209,10 +414,12 @@ if __name__ == "__main__":
     ap.add_argument("-s", "--shutter-count", type=int, help="shutter trigger count")
     ap.add_argument("--stack-count", type=int, help="stack count for macro mode")
     ap.add_argument("-d", "--delay", type=int, default=1, help="delay [s]")
+    ap.add_argument("--settle", type=float, default=SETTLE_TIME, help="settle time after movement before capture [s]")
     ap.add_argument("--name", default=None, help="optional directory name")
     ap.add_argument("-e", "--external-trigger", help="use an external USB trigger board")
     ap.add_argument("-p", "--picamera", action="store_true", default=False, help="use a raspberry pi camera module")
     ap.add_argument("--lowres", action="store_true", default=False, help="use a low resolution with the raspberry pi camera")
+    ap.add_argument("--video-port", action="store_true", default=False, help="capture via the picamera video port (faster, slightly lower quality)")
     ap.add_argument("--debug", action="store_true", default=False, help="print debug messages")
     args = vars(ap.parse_args())
     
@@ -235,7 +442,15 @@ if __name__ == "__main__":
     consoleHandler = logging.StreamHandler()
     consoleHandler.setLevel(logging.DEBUG)
     consoleHandler.setFormatter(formatter)
-    log.addHandler(consoleHandler)
+
+    if args["debug"]:
+        # debug needs real-time output, no buffering
+        log.addHandler(consoleHandler)
+    else:
+        # batch records in memory and flush to stderr only every 64
+        # records or on WARNING, avoids a blocking console write per shot
+        log.addHandler(logging.handlers.MemoryHandler(
+            capacity=64, flushLevel=logging.WARNING, target=consoleHandler))
 
     # global exception hook for killing the serial connection
     sys.excepthook = global_except_hook
@@ -251,22 +466,29 @@ if __name__ == "__main__":
                 timeout=SERIAL_TIMEOUT_READ, 
                 write_timeout=SERIAL_TIMEOUT_WRITE)
 
-            log.debug("opening port {} successful".format(port_name))
+            _enable_low_latency(ser_grbl)
+
+            log.debug("opening port %s successful", port_name)
             break
         except Exception as e:
-            log.debug("opening port {} failed: {}".format(port_name, e))
+            log.debug("opening port %s failed: %s", port_name, e)
 
     if ser_grbl is None:
         log.error("no grbl found on all ports. exit.")
         sys.exit(-1)
 
-    time.sleep(2.0)
-    response = ser_grbl.read(100) # get rid of init message "Grbl 1.1h ['$' for help]"
+    # wait for the boot banner "Grbl 1.1h ['$' for help]" and continue as
+    # soon as it arrives instead of hard-sleeping 2s; the raised timeout
+    # doubles as the fallback deadline for boards without a banner
+    ser_grbl.timeout = 2.0
+    banner = ser_grbl.read_until(b"for help]\r\n", size=256)
+    ser_grbl.timeout = SERIAL_TIMEOUT_READ
+    log.debug("grbl banner: %s", banner)
 
     if args["command"] == MODE_DISABLE:
         log.info("disabling motors...")
         resp = _send_command(ser_grbl, "$X")
-        log.info("grbl: {}".format(resp))
+        log.info("grbl: %s", resp)
         close_ports()
         log.info("motors disabled. exit...")
         sys.exit()
@@ -281,21 +503,19 @@ if __name__ == "__main__":
 
             # base dir
             try:
-                if not os.path.exists(args["output_dir"]): 
-                    os.makedirs(args["output_dir"])
+                os.makedirs(args["output_dir"], exist_ok=True)
             except OSError as e:
-                log.error("creating directory {} failed".format(args["output_dir"]))
+                log.error("creating directory %s failed", args["output_dir"])
 
             # capture specific dir
             if args["name"] is not None:
                 try:
-                    if not os.path.exists(os.path.join(args["output_dir"], args["name"])): 
-                        os.makedirs(os.path.join(args["output_dir"], args["name"]))
+                    os.makedirs(os.path.join(args["output_dir"], args["name"]), exist_ok=True)
                 except OSError as e:
-                    log.error("creating directory {} failed".format(os.path.join(args["output_dir"], args["name"])))
+                    log.error("creating directory %s failed", os.path.join(args["output_dir"], args["name"]))
 
         else:
-            log.warn("platform is not raspberry pi ({}), not creating OUTPUT_DIRECTORY: {}".format(os.uname().nodename, args["output_dir"]))
+            log.warn("platform is not raspberry pi (%s), not creating OUTPUT_DIRECTORY: %s", os.uname().nodename, args["output_dir"])
 
 
     if args["picamera"]:
@@ -312,18 +532,20 @@ if __name__ == "__main__":
         # "G91",                      # relative positioning
         "G90",                      # absolute positioning
         "G21",                      # set units to millimeters
-        "G10 P0 L20 X0 Y0 Z0",      # set current pos as zero
         "G1 F{}".format(FEEDRATE)   # set feedrate to _ mm/min
     ]
 
-    for cmd in grbl_setup_commands:
-        resp = _send_command(ser_grbl, cmd)
+    _stream_commands(ser_grbl, grbl_setup_commands)
+
+    # G10 writes to EEPROM, during which grbl drops incoming bytes
+    # (interrupts are disabled on AVR boards), so it must go through the
+    # plain one-command handshake and never the streaming path
+    _send_command(ser_grbl, "G10 P0 L20 X0 Y0 Z0") # set current pos as zero
 
     # modes
 
     if args["command"] == MODE_INTERVAL: # INTERVAL/TIMELAPSE MODE 
 
-        steps = []
         step_size = [0, 0, 0]
 
         if input_shutter <= 1:
@@ -338,21 +560,38 @@ if __name__ == "__main__":
         if not args["z"] is None:
             step_size[2] = float(args["z"])/(input_shutter-1)
 
-        for i in range(0, input_shutter+1):
-            steps.append([step_size[0] * i, step_size[1] * i, step_size[2] * i])
-        
+        steps = np.outer(np.arange(input_shutter+1), np.array(step_size, dtype=np.float32))
+
+        output_dir_path = args["output_dir"]
+        if args["name"] is not None:
+            output_dir_path = os.path.join(args["output_dir"], args["name"])
+
+        capture_queue = queue.Queue()
+        capture_thread = threading.Thread(target=_capture_worker, args=(capture_queue,), daemon=True)
+        capture_thread.start()
+
+        # feedrate is modal, set it once so every move line can omit F
+        _send_command(ser_grbl, "G1 F{}".format(FEEDRATE_SLOW))
+
+        # pre-render the full gcode program and log lines once, the hot
+        # loop then only does serial I/O. 4 decimals is grbl's precision
+        # limit anyway, and axes that never move are left out entirely,
+        # shorter coordinates mean fewer bytes on the wire.
+        axes = [a for a in range(0, 3) if step_size[a] != 0] or [0]
+        gcode = ["G1 " + " ".join("{}{:.4f}".format("XYZ"[a], steps[i][a]) for a in axes) for i in range(0, input_shutter)]
+        titles = ["INTERVAL {}/{} | X: {:5.2f} Y:{:5.2f} Z:{:5.2f}".format(i+1, input_shutter, *steps[i]) for i in range(0, input_shutter)]
+
         for i in range(0, input_shutter):
 
-            log.info("INTERVAL {}/{} | X: {:5.2f} Y:{:5.2f} Z:{:5.2f}".format(
-                i+1, input_shutter, *steps[i]))
+            log.info(titles[i])
 
             # move
-            cmd = "G1 X{} Y{} Z{} F{}".format(*steps[i], FEEDRATE_SLOW)
-            _send_command(ser_grbl, cmd)
+            _send_command(ser_grbl, gcode[i])
 
             wait_for_idle()
+            t_idle = time.monotonic()
 
-            log.debug("TRIGGER [{}/{}]".format(i+1, input_shutter))
+            log.debug("TRIGGER [%s/%s]", i+1, input_shutter)
 
             # EXT SHUTTER:
 
@@ -372,30 +611,33 @@ if __name__ == "__main__":
 
             # GPHOTO:
 
-            time.sleep(PRE_CAPTURE_WAIT)
+            if len(capture_errors) > 0:
+                raise capture_errors[0]
 
-            temp_file = "capt0000{}".format(FILE_EXTENSION)
-            output_dir_path = args["output_dir"]
-            if args["name"] is not None:
-                output_dir_path = os.path.join(args["output_dir"], args["name"])
             filename = _acquire_filename(output_dir_path)
 
-            if filename is None:
-                raise Exception("could not acquire filename")
+            # filename acquisition already ate into the settle window,
+            # sleep only for whatever vibration decay time is left
+            remaining = args["settle"] - (time.monotonic() - t_idle)
+            if remaining > 0:
+                time.sleep(remaining)
 
             if args["picamera"]:
-                camera.capture(os.path.join(*filename))
+                capture_queue.put((os.path.join(*filename), _capture_picamera))
             else:
-                subprocess.run("gphoto2 --capture-image-and-download --force-overwrite", shell=True, check=True)
-            
-                if not os.path.exists(temp_file):
-                    raise Exception("captured image file missing")
-                shutil.move(temp_file, os.path.join(*filename))
+                capture_queue.put((os.path.join(*filename), _capture_gphoto))
 
-            log.debug("FILE: {}".format(filename[1]))
+            log.debug("FILE: %s", filename[1])
 
             time.sleep(POST_CAPTURE_WAIT)
 
+        # wait till all queued captures are saved to disk
+
+        capture_queue.join()
+
+        if len(capture_errors) > 0:
+            raise capture_errors[0]
+
         # return to home
 
         log.info("return home")
@@ -431,55 +673,57 @@ if __name__ == "__main__":
         if not args["z"] is None and input_shutter > 1:
             step_size[2] = float(args["z"])/(input_shutter-1)
 
-        x_steps = []
-        for i in range(0, input_stack+1):
-            x_steps.append(step_size[0] * i)
+        x_steps = np.arange(input_stack+1) * step_size[0]
         for i in range(0, input_shutter+1):
             steps.append([x_steps, step_size[1] * i, step_size[2] * i])
 
-        # log.info("MACRO {} | stack: {} X: {:5.2f} Y:{:5.2f} Z:{:5.2f}".format(int(input_shutter*input_stack), input_stack, *steps[i]))
+        # log.info("MACRO %s | stack: %s X: %5.2f Y:%5.2f Z:%5.2f", int(input_shutter*input_stack), input_stack, *steps[i])
+
+        stack_paths = [os.path.join(args["output_dir"], "stack_{}".format(i)) for i in range(0, input_shutter)]
+
+        # feedrate is modal, set it once so the move lines can omit F
+        _send_command(ser_grbl, "G1 F{}".format(FEEDRATE_SLOW))
 
         for i in range(0, input_shutter):
 
-            stack_dir = "stack_{}".format(i)
+            try:
+                os.makedirs(stack_paths[i], exist_ok=True)
+                log.debug("created stack dir: %s", stack_paths[i])
+            except OSError as e:
+                log.error("creating stack dir %s failed: %s", stack_paths[i], e)
 
-            if os.path.exists(args["output_dir"]):
-                try:
-                    os.mkdir(os.path.join(args["output_dir"], stack_dir))
-                    log.debug("created stack dir: {}".format(stack_dir))
-                except Exception as e:
-                    log.error("creating stack dir {} failed".format(e))
-            else:
-                log.error("OUTPUT_DIRECTORY {} missing".format(args["output_dir"]))
+            # Y/Z stay constant within a stack, position them once and
+            # send X-only moves in the inner loop
+            _send_command(ser_grbl, "G1 Y{:.4f} Z{:.4f}".format(steps[i][1], steps[i][2]))
 
             for j in range(0, input_stack):
 
                 # move
-                cmd = "G1 X{} Y{} Z{} F{}".format(steps[i][0][j], steps[i][1], steps[i][2], FEEDRATE_SLOW)
+                cmd = "G1 X{:.4f}".format(steps[i][0][j])
                 _send_command(ser_grbl, cmd)
 
                 wait_for_idle()
+                t_idle = time.monotonic()
 
-                log.info("TRIGGER img in stack {}/{} | stack: {}/{} | total {}/{}".format(j+1, input_stack, i, input_shutter, i*input_stack + j+1, input_stack*input_shutter))
-
-                time.sleep(PRE_CAPTURE_WAIT)
+                log.info("TRIGGER img in stack %s/%s | stack: %s/%s | total %s/%s", j+1, input_stack, i, input_shutter, i*input_stack + j+1, input_stack*input_shutter)
 
-                filename = _acquire_filename(os.path.join(args["output_dir"], stack_dir))
+                filename = _acquire_filename(stack_paths[i])
 
-                if filename is None:
-                    raise Exception("could not acquire filename")
+                remaining = args["settle"] - (time.monotonic() - t_idle)
+                if remaining > 0:
+                    time.sleep(remaining)
 
                 if args["picamera"]:
-                    camera.capture(os.path.join(*filename))
+                    _capture_picamera(os.path.join(*filename))
                 else:
                     log.error("gphoto not supported in macro mode yet")
                     sys.exit(-1)
 
-                log.debug("FILE: {}".format(filename[1]))
+                log.debug("FILE: %s", filename[1])
 
                 time.sleep(POST_CAPTURE_WAIT)
 
-            log.info("stack {} finished".format(i))
+            log.info("stack %s finished", i)
 
         # return to home
 
@@ -495,7 +739,7 @@ if __name__ == "__main__":
     elif args["command"] == MODE_MOVE:
 
         pos = [float(args["x"]), float(args["y"]), float(args["z"])]
-        log.info("MOVE | X: {:5.2f} Y:{:5.2f} Z:{:5.2f}".format(*pos))
+        log.info("MOVE | X: %5.2f Y:%5.2f Z:%5.2f", *pos)
 
         cmd = "G1 X{} Y{} Z{} F{}".format(*pos, FEEDRATE)
         _send_command(ser_grbl, cmd)
@@ -517,7 +761,7 @@ if __name__ == "__main__":
     elif args["command"] == MODE_VIDEO:
 
         pos = [float(args["x"]), float(args["y"]), float(args["z"])]
-        log.info("VIDEO | X: {:5.2f} Y:{:5.2f} Z:{:5.2f} F: {}".format(*pos, args["feedrate"]))
+        log.info("VIDEO | X: %5.2f Y:%5.2f Z:%5.2f F: %s", *pos, args["feedrate"])
 
         cmd = "G1 "
 
@@ -541,7 +785,7 @@ if __name__ == "__main__":
     elif args["command"] == MODE_BOUNCE:
 
         pos = [float(args["x"]), float(args["y"]), float(args["z"])]
-        log.info("BOUNCE | X: {:5.2f} Y:{:5.2f} Z:{:5.2f} F: {}".format(*pos, args["feedrate"]))
+        log.info("BOUNCE | X: %5.2f Y:%5.2f Z:%5.2f F: %s", *pos, args["feedrate"])
 
         move_cmd = "G1 "
 